@@ -1,27 +1,91 @@
-import json
+import atexit
 import logging
-from flask import Flask, render_template, send_from_directory, request
+import logging.handlers
+import os
+import queue
+from flask import Flask, send_file, request
+from jinja2 import FileSystemBytecodeCache
 from modules.home import render_home
-from modules.dashboard import render_dashboard
-from modules.power import get_power_data, power_monitor
 
-# Set up logging to file and console
+# Response compression is optional; serve uncompressed if flask-compress is missing
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+# File handler that batches writes through a 64 KiB buffer. Records are flushed
+# as soon as the listener has drained the queue, so a burst of records is written
+# in one go while a single record still reaches the file right away.
+class BufferedFileHandler(logging.FileHandler):
+    def __init__(self, filename, pending_queue):
+        self.pending_queue = pending_queue
+        super().__init__(filename)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=64 * 1024, encoding=self.encoding)
+
+    def flush(self):
+        if self.pending_queue.empty():
+            super().flush()
+
+# Set up logging to file and console. Request threads only put records on a
+# queue; a background listener thread formats them and does the actual I/O.
+log_queue = queue.Queue(-1)
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+file_handler = BufferedFileHandler('app_log.txt', log_queue)
+file_handler.setFormatter(log_formatter)
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(log_formatter)
+
+queue_handler = logging.handlers.QueueHandler(log_queue)
+# Pass the bare message through the queue; the listener's handlers add the prefix
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app_log.txt'),
-        logging.StreamHandler()
-    ]
+    handlers=[queue_handler]
 )
+log_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Debug mode (debugger and reloader) is opt-in via FLASK_DEBUG=1
+DEBUG = os.environ.get('FLASK_DEBUG') == '1'
+
+# With the reloader active this module also runs in the file-watcher process;
+# only the child process that actually serves requests sets WERKZEUG_RUN_MAIN
+SERVING_PROCESS = not DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
 
 # Initialize Flask app with template and static folders
 app = Flask(__name__, template_folder='templates', static_folder='static')
+# Static URLs such as /static/base.css aren't versioned, so keep their cache
+# lifetime short; browsers revalidate with 304s once it expires. Only the
+# favicon route below opts into a one-year max-age.
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 5 * 60
+# Always emit compact JSON from jsonify, also in debug mode
+app.json.compact = True
 
-# Route for favicon
+# Keep compiled templates on disk across restarts. Jinja's default cache
+# directory is private to the current user (mode 0700, owner checked).
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+# Only stat() template files for changes when running in debug mode. The
+# environment already exists at this point, so set it directly rather than
+# through TEMPLATES_AUTO_RELOAD.
+app.jinja_env.auto_reload = DEBUG
+
+# Compress HTML, JSON, CSS and JS responses when flask-compress is installed
+if Compress is not None:
+    app.config['COMPRESS_MIMETYPES'] = ['text/html', 'application/json', 'text/css', 'application/javascript']
+    app.config['COMPRESS_LEVEL'] = 4
+    Compress(app)
+
+# Favicon path, resolved once instead of per request
+FAVICON_PATH = os.path.join(app.static_folder, 'favicon.ico')
+
+# Route for favicon (cached by browsers for a year, revalidated with 304s)
 @app.route('/favicon.ico')
 def favicon():
-    return send_from_directory(app.static_folder, 'favicon.ico')
+    return send_file(FAVICON_PATH, mimetype='image/x-icon', max_age=60 * 60 * 24 * 365, conditional=True)
 
 # Route for homepage
 @app.route('/')
@@ -29,25 +93,47 @@ def home():
     return render_home()
 
 # Route for Energy Dashboard
+# Page modules other than the homepage are imported on first use, so psycopg2 and
+# requests are only loaded once the page is actually visited.
 @app.route('/dashboard')
 def dashboard():
+    from modules.dashboard import render_dashboard
     return render_dashboard(request)
 
 # Route for Power Monitor
 @app.route('/power')
 def power_monitor_route():
+    from modules.power import power_monitor
     return power_monitor()
 
 # API endpoint for power data
 @app.route('/api/power')
 def power_data():
+    from modules.power import get_power_data
     return get_power_data()
 
-# Log startup URLs
-logging.info("Starting Flask server...")
-logging.info("Application available at: http://localhost:5000")
-logging.info("Also accessible at: http://100.115.92.200:5000 (within Crostini network)")
+# Server port
+PORT = 5000
+
+# Log startup URLs (once, from the serving process)
+if SERVING_PROCESS:
+    logging.info("Starting Flask server...")
+    logging.info("Application available at: http://localhost:%d", PORT)
+    logging.info("Also accessible at: http://100.115.92.200:%d (within Crostini network)", PORT)
+
+# Render the static pages once at startup so the first visitor doesn't pay for
+# module imports and template compilation. /dashboard and /api/power are skipped
+# because they depend on the database and the P1-meter.
+def warm_up():
+    try:
+        with app.test_client() as client:
+            client.get('/')
+            client.get('/power')
+    except Exception as e:
+        logging.warning("Warm-up request failed: %s", e)
 
 # Run the Flask app
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    if SERVING_PROCESS:
+        warm_up()
+    app.run(host='0.0.0.0', port=PORT, debug=DEBUG, use_reloader=DEBUG)
\ No newline at end of file
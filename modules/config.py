@@ -0,0 +1,44 @@
+# modules/config.py
+#
+# Description:
+# This module loads config.json once per process and shares the parsed settings
+# with the page modules, so the file is not re-opened and re-parsed per module.
+#
+# Version History:
+# Version 1.0 (2026-10-15): Initial version with a cached config.json loader.
+# Version 1.1 (2026-10-15): Resolve config.json once relative to the project directory
+#                           instead of the current working directory.
+# Version 1.2 (2026-10-15): Parse with orjson when it is installed, falling back to json.
+# Version 1.3 (2026-10-15): Added shared TCP keepalive options for PostgreSQL connections.
+
+import logging
+import os
+from functools import lru_cache
+
+# Use orjson for parsing when it is installed, otherwise the standard library
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Path to config.json in the project directory, resolved once at import
+CONFIG_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'config.json'))
+
+# TCP keepalive options for long-lived PostgreSQL connections, so a dead
+# connection is detected by the OS instead of on the next query
+DB_KEEPALIVE_OPTIONS = {
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3
+}
+
+# Load configuration from config.json (cached after the first call)
+@lru_cache(maxsize=1)
+def load_config():
+    try:
+        with open(CONFIG_PATH, 'rb') as config_file:
+            return json_loads(config_file.read())
+    except Exception as e:
+        logging.error("Error loading config.json: %s", e)
+        raise
\ No newline at end of file
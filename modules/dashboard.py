@@ -6,102 +6,184 @@
 #
 # Version History:
 # Version 1.0 (2025-10-22): Initial version for modular Energy Dashboard.
+# Version 1.1 (2026-10-15): Switched logging calls to %-style arguments so messages are
+#                           only formatted when the record is emitted.
+# Version 1.2 (2026-10-15): Load settings through the shared cached loader in modules/config.py.
+# Version 1.3 (2026-10-15): Build table rows from a module-level column tuple.
+# Version 1.4 (2026-10-15): Reuse database connections from a pool instead of connecting
+#                           on every request.
+# Version 1.5 (2026-10-15): Cast NUMERIC columns to double precision in SQL so rows arrive
+#                           as floats instead of per-cell Decimal objects.
+# Version 1.6 (2026-10-15): Look up the database config section once.
+# Version 1.7 (2026-10-15): Split query and rendering into helpers and cache rendered pages
+#                           for date/times in the past, whose records no longer change.
+# Version 1.8 (2026-10-15): Pass the shared chart timestamps to the template once.
+# Version 1.9 (2026-10-15): Cache the latest records for one polling interval.
+# Version 1.10 (2026-10-15): Enable TCP keepalives on pooled connections.
+# Version 1.11 (2026-10-15): Create the connection pool under a lock so concurrent first
+#                            requests can't each open (and leak) a pool.
+# Version 1.12 (2026-10-15): Return active_power_w as an integer so the table keeps showing
+#                            whole watts (-543, not -543.0).
+# Version 1.13 (2026-10-15): Wait for a free pooled connection instead of failing when all
+#                            DB_MAX_CONNECTIONS are in use.
 
-import json
 import logging
+import threading
+import time
 import psycopg2
+import psycopg2.pool
 from flask import render_template
 from datetime import datetime
+from functools import lru_cache
+from modules.config import DB_KEEPALIVE_OPTIONS, load_config
 
 # Load configuration from config.json
-try:
-    with open('config.json', 'r') as config_file:
-        config = json.load(config_file)
-except Exception as e:
-    logging.error(f"Error loading config.json: {e}")
-    raise
+config = load_config()
 
 # Extract database configuration
-DB_HOST = config['database']['host']
-DB_NAME = config['database']['name']
-DB_USER = config['database']['user']
-DB_PASSWORD = config['database']['password']
+db_config = config['database']
+DB_HOST = db_config['host']
+DB_NAME = db_config['name']
+DB_USER = db_config['user']
+DB_PASSWORD = db_config['password']
 
-def render_dashboard(request):
+# The reader stores a new record once per polling interval, so the latest
+# records are cached for that long
+LATEST_CACHE_SECONDS = config['polling_interval_seconds']
+
+# Connection pool limits (one idle connection is kept open between requests)
+DB_MIN_CONNECTIONS = 1
+DB_MAX_CONNECTIONS = 8
+
+# Column names of the dashboard query, in SELECT order
+DATA_COLUMNS = (
+    'timestamp',
+    'total_power_import_kwh',
+    'total_power_export_kwh',
+    'active_power_w',
+    'total_gas_m3'
+)
+
+# Connection pool shared by dashboard requests, created on first use
+db_pool = None
+db_pool_lock = threading.Lock()
+
+# getconn() raises PoolError when the pool is exhausted instead of waiting, so
+# requests take a slot here first and block until a connection is free
+db_connection_slots = threading.BoundedSemaphore(DB_MAX_CONNECTIONS)
+
+# Return the shared pool, creating it once even if several request threads
+# arrive before it exists
+def get_db_pool():
+    global db_pool
+    if db_pool is None:
+        with db_pool_lock:
+            if db_pool is None:
+                db_pool = psycopg2.pool.ThreadedConnectionPool(
+                    DB_MIN_CONNECTIONS,
+                    DB_MAX_CONNECTIONS,
+                    host=DB_HOST,
+                    database=DB_NAME,
+                    user=DB_USER,
+                    password=DB_PASSWORD,
+                    **DB_KEEPALIVE_OPTIONS
+                )
+    return db_pool
+
+# Fetch the 100 records before the selected date/time
+def fetch_readings(selected_datetime):
+    # Borrow a connection from the pool, waiting for one if all are in use
+    db_pool = get_db_pool()
+    db_connection_slots.acquire()
+    try:
+        conn = db_pool.getconn()
+    except Exception:
+        db_connection_slots.release()
+        raise
     try:
-        # Connect to the database
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            database=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD
-        )
         cur = conn.cursor()
-        
-        # Get date and time from query parameters
-        selected_date = request.args.get('selected_date')
-        selected_time = request.args.get('selected_time')
-        if selected_date and selected_time:
-            try:
-                selected_datetime = datetime.strptime(f"{selected_date} {selected_time}", '%Y-%m-%d %H:%M')
-            except ValueError as e:
-                logging.error(f"Error parsing date/time: {e}")
-                return "Invalid date or time format. Use YYYY-MM-DD and HH:MM.", 400
-        else:
-            selected_datetime = datetime.now()
-        
-        # Fetch the 100 records before the selected date/time
+        # Readings arrive as plain numbers instead of Decimal objects. The P1-meter
+        # reports whole watts, so active_power_w is returned as an integer.
         cur.execute("""
             SELECT to_char(timestamp, 'YYYY-MM-DD HH24:MI:SS'),
-                   total_power_import_kwh, total_power_export_kwh,
-                   active_power_w, total_gas_m3
+                   total_power_import_kwh::double precision,
+                   total_power_export_kwh::double precision,
+                   active_power_w::bigint,
+                   total_gas_m3::double precision
             FROM p1_meter_data
             WHERE timestamp <= %s
             ORDER BY timestamp DESC
             LIMIT 100;
         """, (selected_datetime,))
         rows = cur.fetchall()
-        
-        # Convert rows to a list of dictionaries for the table
-        data = [
-            {
-                'timestamp': row[0],
-                'total_power_import_kwh': row[1],
-                'total_power_export_kwh': row[2],
-                'active_power_w': row[3],
-                'total_gas_m3': row[4]
-            } for row in rows
-        ]
-        
-        # Prepare data for charts
-        timestamps = [row[0] for row in rows]
-        power_import_y = [row[1] for row in rows]
-        power_export_y = [row[2] for row in rows]
-        active_power_y = [row[3] for row in rows]
-        gas_y = [row[4] for row in rows]
-        
         cur.close()
-        conn.close()
-        
-        # Format current date and time for form defaults
-        current_date = selected_datetime.strftime('%Y-%m-%d')
-        current_time = selected_datetime.strftime('%H:%M')
-        
-        return render_template(
-            'dashboard.html',
-            data=data,
-            power_import_x=timestamps,
-            power_import_y=power_import_y,
-            power_export_x=timestamps,
-            power_export_y=power_export_y,
-            active_power_x=timestamps,
-            active_power_y=active_power_y,
-            gas_x=timestamps,
-            gas_y=gas_y,
-            current_date=current_date,
-            current_time=current_time
-        )
+        return rows
+    finally:
+        # Return the connection, discarding it if it broke during the query
+        try:
+            db_pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            db_connection_slots.release()
+
+# Fetch the latest records, reusing the result within one cache period.
+# time_bucket is the current period number, so a new period is a cache miss.
+@lru_cache(maxsize=1)
+def fetch_latest_readings(time_bucket):
+    return fetch_readings(datetime.now())
+
+# Render the dashboard for the given records
+def build_dashboard(selected_datetime, rows):
+    # Convert rows to a list of dictionaries for the table
+    data = [dict(zip(DATA_COLUMNS, row)) for row in rows]
+    
+    # Prepare data for charts
+    timestamps = [row[0] for row in rows]
+    power_import_y = [row[1] for row in rows]
+    power_export_y = [row[2] for row in rows]
+    active_power_y = [row[3] for row in rows]
+    gas_y = [row[4] for row in rows]
     
+    # Format current date and time for form defaults
+    current_date = selected_datetime.strftime('%Y-%m-%d')
+    current_time = selected_datetime.strftime('%H:%M')
+    
+    return render_template(
+        'dashboard.html',
+        data=data,
+        timestamps=timestamps,
+        power_import_y=power_import_y,
+        power_export_y=power_export_y,
+        active_power_y=active_power_y,
+        gas_y=gas_y,
+        current_date=current_date,
+        current_time=current_time
+    )
+
+# Records before a date/time in the past never change, so those pages are cached
+@lru_cache(maxsize=32)
+def build_history_dashboard(selected_datetime):
+    return build_dashboard(selected_datetime, fetch_readings(selected_datetime))
+
+def render_dashboard(request):
+    # Get date and time from query parameters
+    selected_date = request.args.get('selected_date')
+    selected_time = request.args.get('selected_time')
+    if selected_date and selected_time:
+        try:
+            selected_datetime = datetime.strptime(f"{selected_date} {selected_time}", '%Y-%m-%d %H:%M')
+        except ValueError as e:
+            logging.error("Error parsing date/time: %s", e)
+            return "Invalid date or time format. Use YYYY-MM-DD and HH:MM.", 400
+        is_history = selected_datetime < datetime.now()
+    else:
+        selected_datetime = datetime.now()
+        is_history = False
+
+    try:
+        if is_history:
+            return build_history_dashboard(selected_datetime)
+        rows = fetch_latest_readings(int(time.monotonic() // LATEST_CACHE_SECONDS))
+        return build_dashboard(selected_datetime, rows)
     except Exception as e:
-        logging.error(f"Error fetching data: {e}")
+        logging.error("Error fetching data: %s", e)
         return "Error loading data. Check app_log.txt for details.", 500
\ No newline at end of file
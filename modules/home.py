@@ -6,8 +6,19 @@
 #
 # Version History:
 # Version 1.0 (2025-10-22): Initial version for modular homepage.
+# Version 1.1 (2026-10-15): Cache the rendered homepage, which has no per-request state.
+# Version 1.2 (2026-10-15): Bypass the cache in debug mode so template edits show up.
 
-from flask import render_template
+from functools import lru_cache
+from flask import current_app, render_template
 
+# The homepage is static, so render the template once and reuse the HTML
+@lru_cache(maxsize=1)
+def render_cached_home():
+    return render_template('home.html')
+
+# Render the homepage; in debug mode templates auto-reload, so skip the cache
 def render_home():
-    return render_template('home.html')
\ No newline at end of file
+    if current_app.debug:
+        return render_template('home.html')
+    return render_cached_home()
@@ -6,35 +6,40 @@
 #
 # Version History:
 # Version 1.0 (2025-10-22): Initial version for modular Power Monitor.
+# Version 1.1 (2026-10-15): Switched logging calls to %-style arguments so messages are
+#                           only formatted when the record is emitted.
+# Version 1.2 (2026-10-15): Load settings through the shared cached loader in modules/config.py.
+# Version 1.3 (2026-10-15): Removed the unused in-memory power_data list.
+# Version 1.4 (2026-10-15): Look up the power_monitor config section once.
+# Version 1.5 (2026-10-15): Fail fast on slow P1-meter responses (one quick retry, shorter
+#                           timeouts) so live requests don't outlast the polling frequency.
+# Version 1.6 (2026-10-15): Dropped the retry and tightened the timeouts so connect + read
+#                           (1.7s) actually stays under the minimum 2s polling frequency.
 
-import json
 import logging
 import requests
 from flask import render_template, jsonify
 from datetime import datetime
+from modules.config import load_config
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 # Load configuration from config.json
-try:
-    with open('config.json', 'r') as config_file:
-        config = json.load(config_file)
-except Exception as e:
-    logging.error(f"Error loading config.json: {e}")
-    raise
+config = load_config()
 
 # Extract configuration
 API_URL = config['p1_meter']['api_url']
-OBSERVATION_WINDOW = config.get('power_monitor', {}).get('observation_window_seconds', 300)
-POLLING_FREQUENCY = max(config.get('power_monitor', {}).get('polling_frequency_seconds', 2), 2)
+power_monitor_config = config.get('power_monitor', {})
+OBSERVATION_WINDOW = power_monitor_config.get('observation_window_seconds', 300)
+POLLING_FREQUENCY = max(power_monitor_config.get('polling_frequency_seconds', 2), 2)
 
-# In-memory storage for power data
-power_data = []
+# Connect/read timeouts for live requests; together (1.7s) they stay below the
+# minimum polling frequency of 2s
+API_TIMEOUT = (0.5, 1.2)
 
-# Set up HTTP session with retries
+# Set up a keep-alive HTTP session without retries. A live reading is stale by
+# the next poll, so a failed request is simply picked up again by the next poll.
 session = requests.Session()
-retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-session.mount('http://', HTTPAdapter(max_retries=retries))
+session.mount('http://', HTTPAdapter(max_retries=0))
 
 def power_monitor():
     return render_template(
@@ -45,7 +50,7 @@ def power_monitor():
 
 def get_power_data():
     try:
-        response = session.get(API_URL, timeout=(3, 5))
+        response = session.get(API_URL, timeout=API_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         active_power_w = data.get('active_power_w')
@@ -57,8 +62,8 @@ def get_power_data():
             'active_power_w': float(active_power_w)
         })
     except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching data from P1-meter: {e}")
+        logging.error("Error fetching data from P1-meter: %s", e)
         return jsonify({'error': str(e)}), 500
     except ValueError as e:
-        logging.error(f"Error parsing JSON: {e}")
+        logging.error("Error parsing JSON: %s", e)
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -27,10 +27,17 @@
 #                           check/start to support Crostini, with fallback to manual start.
 # Version 1.7 (2025-10-22): Suppressed "Data inserted successfully" log message to reduce
 #                           console output, retaining other logs.
+# Version 1.8 (2026-10-15): Load config.json through the shared cached loader in
+#                           modules/config.py used by the web application.
+# Version 1.9 (2026-10-15): Made PARAMETERS_TO_LOG an immutable tuple.
+# Version 1.10 (2026-10-15): Removed the unused PARAM_TYPE_MAP.
+# Version 1.11 (2026-10-15): Install signal handlers in main() instead of at import time.
+# Version 1.12 (2026-10-15): Look up the database config section once.
+# Version 1.13 (2026-10-15): Build the INSERT statement once at startup instead of per poll.
+# Version 1.14 (2026-10-15): Enable TCP keepalives on the database connection.
 
 import requests
 import psycopg2
-import json
 import time
 import logging
 import signal
@@ -39,6 +46,7 @@ import subprocess
 from datetime import datetime
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from modules.config import DB_KEEPALIVE_OPTIONS, load_config
 
 # Set up logging to file and console
 logging.basicConfig(
@@ -85,35 +93,33 @@ def ensure_postgresql_service(max_attempts=3, delay=5):
 
 # Load configuration from config.json
 try:
-    with open('config.json', 'r') as config_file:
-        config = json.load(config_file)
-except Exception as e:
-    logging.error(f"Error loading config.json: {e}")
+    config = load_config()
+except Exception:
     sys.exit(1)
 
 # Extract configuration
 API_URL = config['p1_meter']['api_url']
 INTERVAL_SECONDS = config['polling_interval_seconds']
-DB_HOST = config['database']['host']
-DB_NAME = config['database']['name']
-DB_USER = config['database']['user']
-DB_PASSWORD = config['database']['password']
+db_config = config['database']
+DB_HOST = db_config['host']
+DB_NAME = db_config['name']
+DB_USER = db_config['user']
+DB_PASSWORD = db_config['password']
 
 # Define parameters to log
-PARAMETERS_TO_LOG = [
+PARAMETERS_TO_LOG = (
     'total_power_import_kwh',
     'total_power_export_kwh',
     'active_power_w',
     'total_gas_m3'
-]
+)
 
-# Map API parameter types to PostgreSQL types
-PARAM_TYPE_MAP = {
-    'total_power_import_kwh': 'NUMERIC',
-    'total_power_export_kwh': 'NUMERIC',
-    'active_power_w': 'NUMERIC',
-    'total_gas_m3': 'NUMERIC'
-}
+# INSERT statement for the logged parameters, built once since they never change
+INSERT_COLUMNS = ('timestamp',) + PARAMETERS_TO_LOG
+INSERT_SQL = (
+    f"INSERT INTO p1_meter_data ({', '.join(INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(INSERT_COLUMNS))})"
+)
 
 # Set up HTTP session with retries
 session = requests.Session()
@@ -131,9 +137,6 @@ def signal_handler(sig, frame):
         logging.info("Database connection closed.")
     sys.exit(0)
 
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
-
 # Function to connect to the database with retry
 def connect_db(max_attempts=3, delay=5):
     attempts = 0
@@ -143,7 +146,8 @@ def connect_db(max_attempts=3, delay=5):
                 host=DB_HOST,
                 database=DB_NAME,
                 user=DB_USER,
-                password=DB_PASSWORD
+                password=DB_PASSWORD,
+                **DB_KEEPALIVE_OPTIONS
             )
             logging.info("Successfully connected to database.")
             return conn
@@ -206,11 +210,8 @@ def validate_data(data):
 def insert_data(conn, data):
     try:
         cur = conn.cursor()
-        columns = ['timestamp'] + PARAMETERS_TO_LOG
-        placeholders = ['%s'] * len(columns)
         values = [datetime.now()] + [data.get(param) for param in PARAMETERS_TO_LOG]
-        insert_sql = f"INSERT INTO p1_meter_data ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
-        cur.execute(insert_sql, values)
+        cur.execute(INSERT_SQL, values)
         conn.commit()
         cur.close()
     except psycopg2.IntegrityError as e:
@@ -222,6 +223,10 @@ def insert_data(conn, data):
 
 # Main loop to read data periodically
 def main():
+    # Install shutdown handlers here rather than at import time
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
     # Check and start PostgreSQL service
     if not ensure_postgresql_service():
         sys.exit(1)